@@ -0,0 +1,37 @@
+# cython: language_level=3
+"""Optional Cython fast path for the hot scan loops of the compare tools.
+
+Build in place with:
+
+    pip install cython
+    cythonize -i compare_ext.pyx
+
+The scripts fall back to equivalent pure-Python code when the compiled
+module is not importable, so building this is never required.
+"""
+
+
+def scan_diff(set candidate_set, dict candidate_entries, tgt_set):
+    """Return the sorted [(line_no, line), ...] entries whose hash is in
+    *candidate_set* but not in *tgt_set*, i.e. the per-target scan of
+    folder_line_compare without per-iteration interpreter dispatch."""
+    missing = []
+    extend = missing.extend
+    for h in candidate_set - tgt_set:
+        extend(candidate_entries[h])
+    missing.sort()
+    return missing
+
+
+def scan_missing(list hashes, dict presence, object all_mask):
+    """Return [(index, miss_mask), ...] for fingerprints with a non-zero
+    missing-target mask, i.e. the inner loop of the presence-index scan
+    without per-iteration interpreter dispatch."""
+    cdef Py_ssize_t i, n = len(hashes)
+    result = []
+    append = result.append
+    for i in range(n):
+        miss = (~presence.get(hashes[i], 0)) & all_mask
+        if miss:
+            append((i, miss))
+    return result
@@ -0,0 +1,348 @@
+#!/usr/bin/env python3
+"""compare_ids.py -- compare 12-digit IDs between two folders of .txt files.
+
+For every source file the script extracts all 12-digit IDs (with the line
+numbers and line text where they occur) and checks whether each ID appears
+anywhere in the target folder.  Per source file three outputs are written
+into the output folder:
+
+    <src>.presence.csv    ID,FOUND|MISSING,"line occurrences"
+    <src>.missing.txt     one missing ID per line, with its locations
+    <src>.count.txt       number of missing IDs
+
+MODE controls the direction:
+
+    A2B    files in folder A are sources, folder B is the target
+    B2A    the reverse
+    BOTH   run both passes
+
+Usage:
+    python compare_ids.py <folderA> <folderB> <output_dir> [A2B|B2A|BOTH]
+"""
+
+import functools
+import hashlib
+import mmap
+import os
+import re
+import sys
+import time
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from pathlib import Path
+
+try:
+    import numpy as np
+except ImportError:  # the regex scan below is the fallback
+    np = None
+
+MODE = "BOTH"
+NUM_WORKER_THREADS = 8
+
+# When False, sources without any IDs write only the header/zero-count
+# outputs instead of creating all three report files.
+ALWAYS_WRITE = False
+
+# re.ASCII keeps \d and \b on the ASCII fast path instead of consulting
+# Unicode digit/word tables per character; IDs are ASCII by definition.
+ID_PATTERN = re.compile(r"\b\d{12}\b", re.ASCII)
+BYTE_ID_PATTERN = re.compile(rb"(?<!\d)\d{12}(?!\d)")
+
+
+class SharedIdSet:
+    """Read-only ID membership structure shared across worker processes.
+
+    Pickling a multi-million-element set into every worker is
+    prohibitive, so the union lives in two shared_memory segments that
+    workers attach to by name: a Bloom filter for the fast common-case
+    rejection, and a sorted array of 64-bit IDs probed with bisect to
+    make every Bloom hit exact.
+    """
+
+    # ~34 bits and 23 probes per element gives a false-positive rate of
+    # roughly 1e-7; positives are re-verified against the exact array.
+    BITS_PER_ID = 34
+    NUM_HASHES = 23
+
+    def __init__(self, bloom_shm, exact_shm, num_bits, count, owner=False):
+        self._bloom_shm = bloom_shm
+        self._exact_shm = exact_shm
+        self._num_bits = num_bits
+        self._count = count
+        self._owner = owner
+        self._bloom = bloom_shm.buf
+        self._exact = exact_shm.buf[:count * 8].cast("Q")
+
+    @classmethod
+    def build(cls, id_set: set) -> "SharedIdSet":
+        ids = array("Q", sorted(id_set))
+        count = len(ids)
+        num_bits = max(8, count * cls.BITS_PER_ID)
+        bloom_shm = shared_memory.SharedMemory(create=True, size=(num_bits + 7) // 8)
+        exact_shm = shared_memory.SharedMemory(create=True, size=max(8, count * 8))
+        exact_shm.buf[:count * 8] = ids.tobytes()
+        buf = bloom_shm.buf
+        for v in ids:
+            for bit in cls._bit_positions(v, num_bits):
+                buf[bit >> 3] |= 1 << (bit & 7)
+        return cls(bloom_shm, exact_shm, num_bits, count, owner=True)
+
+    @classmethod
+    def attach(cls, handle: tuple) -> "SharedIdSet":
+        bloom_name, exact_name, num_bits, count = handle
+        return cls(shared_memory.SharedMemory(name=bloom_name),
+                   shared_memory.SharedMemory(name=exact_name),
+                   num_bits, count)
+
+    @classmethod
+    def _bit_positions(cls, value: int, num_bits: int):
+        digest = hashlib.blake2b(value.to_bytes(8, "big"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "big")
+        h2 = int.from_bytes(digest[8:], "big") | 1
+        return ((h1 + i * h2) % num_bits for i in range(cls.NUM_HASHES))
+
+    def handle(self) -> tuple:
+        return (self._bloom_shm.name, self._exact_shm.name, self._num_bits, self._count)
+
+    def __contains__(self, v: int) -> bool:
+        bloom = self._bloom
+        for bit in self._bit_positions(v, self._num_bits):
+            if not bloom[bit >> 3] & (1 << (bit & 7)):
+                return False
+        i = bisect_left(self._exact, v)
+        return i < self._count and self._exact[i] == v
+
+    def __len__(self) -> int:
+        return self._count
+
+    def close(self) -> None:
+        self._exact.release()
+        self._bloom_shm.close()
+        self._exact_shm.close()
+        if self._owner:
+            self._bloom_shm.unlink()
+            self._exact_shm.unlink()
+
+
+# Target union shared with worker processes: each worker attaches to the
+# shared_memory segments once, in the pool initializer.
+_TARGET_UNION = None
+
+
+def _init_worker(union_handle: tuple) -> None:
+    global _TARGET_UNION
+    _TARGET_UNION = SharedIdSet.attach(union_handle)
+
+
+def _process_source_task(source_path: Path, output_dir: Path,
+                         source_label: str, target_label: str) -> dict:
+    return process_source_file_ids(source_path, _TARGET_UNION, output_dir,
+                                   source_label, target_label)
+
+
+def gather_text_files(folder: Path) -> list:
+    """Return the sorted list of .txt files directly inside *folder*.
+
+    Uses os.scandir so the file-type check comes from the cached dirent
+    instead of a stat per entry.
+    """
+    with os.scandir(folder) as it:
+        out = [Path(e.path) for e in it if e.name.lower().endswith(".txt") and e.is_file()]
+    out.sort()
+    return out
+
+
+SNIPPET_WIDTH = 120
+
+# Hot row templates, hoisted so the per-ID loops use one C-level %
+# format instead of rebuilding f-string pieces per row.  Reports are
+# ASCII, so rows are built as bytes and written in binary mode to skip
+# the text codec entirely.
+PRESENCE_HEADER = b"ID,STATUS,OCCURRENCES\n"
+PRESENCE_ROW = b'%012d,%s,"%s"\n'
+MISSING_ROW = b"%012d (%s)\n"
+OCC_WITH_SNIPPET = b"line %d: %s"
+OCC_LINE_ONLY = b"line %d"
+
+def _read_text(path: Path) -> str:
+    """Read a whole file with one binary read and one bulk decode.
+
+    Path.read_text decodes incrementally through TextIOWrapper in
+    default-buffer-sized chunks; reading the raw bytes in one shot and
+    decoding once avoids that layer entirely.
+    """
+    with path.open("rb") as fh:
+        return fh.read().decode("utf-8", "replace")
+
+
+def extract_ids_with_locations(path: Path) -> tuple:
+    """Scan *path* for 12-digit IDs and return (ids_map, line_snippets).
+
+    ids_map maps each ID to a list of (line_no, column_offset);
+    line_snippets holds a report snippet (at most SNIPPET_WIDTH chars)
+    for only the lines that actually contain IDs.  Keeping offsets
+    instead of full line text stops wide lines from being retained once
+    per ID occurrence.
+
+    The file is read as one blob and scanned with a single ``finditer``
+    pass; line numbers are recovered from a precomputed array of line
+    start offsets instead of looping over the file line by line.
+    """
+    data = _read_text(path)
+    line_starts = [0] + [m.end() for m in re.finditer(r"\n", data)]
+    ids = defaultdict(list)
+    line_snippets = {}
+    for m in ID_PATTERN.finditer(data):
+        pos = m.start()
+        line_no = bisect_right(line_starts, pos)
+        start = line_starts[line_no - 1]
+        ids[int(m.group())].append((line_no, pos - start))
+        if line_no not in line_snippets:
+            end = data.find("\n", pos)
+            if end == -1:
+                end = len(data)
+            line_snippets[line_no] = data[start:end].strip()[:SNIPPET_WIDTH]
+    return ids, line_snippets
+
+
+def _ids_from_buffer(buf) -> set:
+    """Extract every 12-digit run from a bytes-like buffer as ints.
+
+    With NumPy available the buffer is scanned as a uint8 array: a
+    boolean digit mask is diffed to find run boundaries and only runs of
+    exactly 12 digits are parsed.  That keeps the scan in one vectorized
+    pass instead of the regex engine's per-candidate backtracking.
+    """
+    if np is None:
+        return set(map(int, BYTE_ID_PATTERN.findall(buf)))
+    arr = np.frombuffer(buf, dtype=np.uint8)
+    is_digit = ((arr >= 0x30) & (arr <= 0x39)).astype(np.int8)
+    edges = np.diff(is_digit, prepend=np.int8(0), append=np.int8(0))
+    starts = np.nonzero(edges == 1)[0]
+    ends = np.nonzero(edges == -1)[0]
+    starts = starts[(ends - starts) == 12]
+    return {int(buf[s:s + 12]) for s in starts}
+
+
+def _extract_ids_one_file(path: Path) -> set:
+    """Extract the set of 12-digit IDs from a single file."""
+    if path.stat().st_size == 0:
+        return set()
+    with path.open("rb") as fh:
+        with mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return _ids_from_buffer(mm)
+
+
+def build_union_id_set_for_folder(folder: Path, threads: int = NUM_WORKER_THREADS) -> set:
+    """Collect every 12-digit ID that occurs anywhere in *folder*.
+
+    Files are memory-mapped and scanned with a bytes-mode regex; the
+    pattern only matches ASCII digits, so decoding the whole file to
+    str first would be wasted work.  Per-file scans run in a worker
+    pool and the per-file sets are unioned in one call.
+    """
+    files = gather_text_files(folder)
+    with ProcessPoolExecutor(max_workers=threads) as ex:
+        return set().union(*ex.map(_extract_ids_one_file, files))
+
+
+def process_source_file_ids(source_path: Path, target_union, output_dir: Path,
+                            source_label: str, target_label: str) -> dict:
+    """Compare one source file's IDs against the target union set."""
+    ids_map, line_snippets = extract_ids_with_locations(source_path)
+    unique_ids = sorted(ids_map)
+
+    stem = f"{source_label}__{source_path.stem}__vs__{target_label}"
+    out_presence = output_dir / f"{stem}.presence.csv"
+    out_missing = output_dir / f"{stem}.missing.txt"
+    out_count = output_dir / f"{stem}.count.txt"
+
+    if not ids_map and not ALWAYS_WRITE:
+        # Nothing to report; skip the missing file and write the two
+        # minimal outputs, saving file creates for folders of tiny files.
+        out_presence.write_bytes(PRESENCE_HEADER)
+        out_count.write_bytes(b"0\n")
+        return {"source": source_path.name, "total_ids": 0, "found": 0, "missing": 0}
+
+    # One fused pass over unique_ids feeds all three reports; each body
+    # is accumulated as pre-encoded bytes and emitted with a single
+    # binary write, so no TextIOWrapper encoding happens per row.
+    presence_parts = [PRESENCE_HEADER]
+    missing_parts = [f"# IDs in {source_path.name} not found anywhere in {target_label}\n"
+                     .encode("utf-8")]
+    missing_count = 0
+    for idv in unique_ids:
+        occurrences = ids_map[idv]
+        if idv in target_union:
+            status = b"FOUND"
+        else:
+            status = b"MISSING"
+            missing_count += 1
+            occ_lns = b", ".join(OCC_LINE_ONLY % ln for ln, _ in occurrences)
+            missing_parts.append(MISSING_ROW % (idv, occ_lns))
+        occ_strs = [OCC_WITH_SNIPPET % (ln, line_snippets[ln].replace(",", " ").encode("utf-8"))
+                    for ln, _ in occurrences]
+        presence_parts.append(PRESENCE_ROW % (idv, status, b" | ".join(occ_strs)))
+
+    out_presence.write_bytes(b"".join(presence_parts))
+    out_missing.write_bytes(b"".join(missing_parts))
+    out_count.write_bytes(b"%d\n" % missing_count)
+
+    return {
+        "source": source_path.name,
+        "total_ids": len(unique_ids),
+        "found": len(unique_ids) - missing_count,
+        "missing": missing_count,
+    }
+
+
+def run_pass_ids(source_folder: Path, target_folder: Path, output_dir: Path,
+                 source_label: str, target_label: str, threads: int = NUM_WORKER_THREADS) -> list:
+    """Run one full source-folder vs target-folder comparison pass."""
+    source_files = gather_text_files(source_folder)
+    print(f"[{source_label}->{target_label}] {len(source_files)} source files")
+
+    target_union = SharedIdSet.build(build_union_id_set_for_folder(target_folder))
+    print(f"[{source_label}->{target_label}] target union holds {len(target_union)} IDs")
+
+    task = functools.partial(_process_source_task, output_dir=output_dir,
+                             source_label=source_label, target_label=target_label)
+    try:
+        with ProcessPoolExecutor(max_workers=threads, initializer=_init_worker,
+                                 initargs=(target_union.handle(),)) as ex:
+            results = list(ex.map(task, source_files,
+                                  chunksize=max(1, len(source_files) // (threads * 4))))
+    finally:
+        target_union.close()
+    for res in results:
+        print(f"  {res['source']}: {res['missing']} missing of {res['total_ids']}")
+    return results
+
+
+def main(argv: list) -> int:
+    if len(argv) < 3:
+        print(__doc__)
+        return 2
+
+    folder_a = Path(argv[0])
+    folder_b = Path(argv[1])
+    output_dir = Path(argv[2])
+    mode = (argv[3] if len(argv) > 3 else MODE).upper()
+
+    output_dir.mkdir(parents=True, exist_ok=True)
+    started = time.time()
+
+    if mode in ("A2B", "BOTH"):
+        run_pass_ids(folder_a, folder_b, output_dir, folder_a.name, folder_b.name)
+    if mode in ("B2A", "BOTH"):
+        run_pass_ids(folder_b, folder_a, output_dir, folder_b.name, folder_a.name)
+
+    print(f"Done in {time.time() - started:.2f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""compare_lines.py -- ordered line-by-line comparison of .txt files.
+
+For every source file, the non-empty lines (in order, with their original
+line numbers) are compared position-by-position against the non-empty
+lines of every target file.  Each source file gets one diff report in the
+output folder listing mismatching positions and any trailing extra lines
+on either side.
+
+MODE controls the direction:
+
+    A2B    files in folder A are sources, folder B holds the targets
+    B2A    the reverse
+    BOTH   run both passes
+
+Usage:
+    python compare_lines.py <folderA> <folderB> <output_dir> [A2B|B2A|BOTH]
+"""
+
+import functools
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+try:
+    import numpy as np
+except ImportError:  # pure-Python mismatch scan below is the fallback
+    np = None
+
+MODE = "BOTH"
+NUM_WORKER_THREADS = 8
+
+# Hot diff-row templates, hoisted so the mismatch loop uses one C-level
+# % format per row instead of rebuilding f-strings.
+DIFF_ROW = "src_ln=%d: %s  !=  tgt_ln=%d: %s"
+EXTRA_SRC_ROW = "extra in source at line %d: %s"
+EXTRA_TGT_ROW = "extra in target at line %d: %s"
+
+
+def gather_text_files(folder: Path) -> list:
+    """Return the sorted list of .txt files directly inside *folder*.
+
+    Uses os.scandir so the file-type check comes from the cached dirent
+    instead of a stat per entry.
+    """
+    with os.scandir(folder) as it:
+        out = [Path(e.path) for e in it if e.name.lower().endswith(".txt") and e.is_file()]
+    out.sort()
+    return out
+
+
+def non_empty_lines_with_orig_lineno(path: Path) -> list:
+    """Return [(original_line_no, line), ...] for the non-empty lines of *path*.
+
+    The file is read in one shot and split with the C-level splitlines;
+    enumerating before filtering keeps the original line numbers without
+    paying generator resumption and per-line read overhead.  The raw
+    bytes are read in one shot and decoded once, skipping TextIOWrapper's
+    chunked incremental decode.
+    """
+    with path.open("rb") as fh:
+        data = fh.read().decode("utf-8", "replace")
+    return [(i, line) for i, line in enumerate(data.splitlines(), 1) if line.strip()]
+
+
+def compare_streams(src_lines: list, tgt_lines: list) -> list:
+    """Compare two (line_no, line) streams position by position.
+
+    Returns a list of human-readable difference strings; an empty list
+    means the two streams are identical.
+
+    Both streams are fingerprinted with 64-bit line hashes first, so the
+    common mostly-identical case reduces to one C-level list (or NumPy
+    array) comparison; diff strings are only materialized for positions
+    whose fingerprints differ and for trailing extra lines.
+    """
+    diffs = []
+    k = min(len(src_lines), len(tgt_lines))
+    h_src = [hash(line) for _, line in src_lines[:k]]
+    h_tgt = [hash(line) for _, line in tgt_lines[:k]]
+    if h_src == h_tgt:
+        mismatches = ()
+    elif np is not None:
+        arr_s = np.array(h_src, dtype=np.int64)
+        arr_t = np.array(h_tgt, dtype=np.int64)
+        mismatches = np.nonzero(arr_s != arr_t)[0]
+    else:
+        mismatches = [i for i in range(k) if h_src[i] != h_tgt[i]]
+    for i in mismatches:
+        a = src_lines[i]
+        b = tgt_lines[i]
+        diffs.append(DIFF_ROW % (a[0], a[1], b[0], b[1]))
+    for ln, line in src_lines[k:]:
+        diffs.append(EXTRA_SRC_ROW % (ln, line))
+    for ln, line in tgt_lines[k:]:
+        diffs.append(EXTRA_TGT_ROW % (ln, line))
+    return diffs
+
+
+def compare_source_to_targets(source_path: Path, target_lines: dict, output_dir: Path,
+                              source_label: str, target_label: str) -> dict:
+    """Write one diff report comparing *source_path* against every target.
+
+    *target_lines* maps each target path to its pre-parsed non-empty
+    line list, so targets are read once per pass rather than once per
+    (source, target) pair.
+    """
+    out_path = output_dir / f"{source_label}__{source_path.stem}__vs__{target_label}.diff.txt"
+    src_lines = non_empty_lines_with_orig_lineno(source_path)
+    total_diffs = 0
+    # Accumulate the whole report in memory and emit it with one write.
+    parts = [f"Source file: {source_path.name}\n"]
+    for tgt, tgt_lines in target_lines.items():
+        diffs = compare_streams(src_lines, tgt_lines)
+        total_diffs += len(diffs)
+        parts.append("=" * 80 + "\n")
+        parts.append(f"Target file: {tgt.name}\n")
+        parts.append("-" * 80 + "\n")
+        if not diffs:
+            parts.append("(no differences)\n")
+        else:
+            parts.extend(d + "\n" for d in diffs)
+    out_path.write_text("".join(parts), encoding="utf-8")
+    return {"source": source_path.name, "total_diffs": total_diffs}
+
+
+def run_pass(source_folder: Path, target_folder: Path, output_dir: Path,
+             source_label: str, target_label: str, threads: int = NUM_WORKER_THREADS) -> list:
+    """Run one full source-folder vs target-folder comparison pass."""
+    source_files = gather_text_files(source_folder)
+    target_files = gather_text_files(target_folder)
+    print(f"[{source_label}->{target_label}] {len(source_files)} sources, "
+          f"{len(target_files)} targets")
+
+    target_lines = {tgt: non_empty_lines_with_orig_lineno(tgt) for tgt in target_files}
+
+    task = functools.partial(compare_source_to_targets, target_lines=target_lines,
+                             output_dir=output_dir, source_label=source_label,
+                             target_label=target_label)
+    with ProcessPoolExecutor(max_workers=threads) as ex:
+        results = list(ex.map(task, source_files,
+                              chunksize=max(1, len(source_files) // (threads * 4))))
+    for res in results:
+        print(f"  {res['source']}: {res['total_diffs']} differing lines")
+    return results
+
+
+def main(argv: list) -> int:
+    if len(argv) < 3:
+        print(__doc__)
+        return 2
+
+    folder_a = Path(argv[0])
+    folder_b = Path(argv[1])
+    output_dir = Path(argv[2])
+    mode = (argv[3] if len(argv) > 3 else MODE).upper()
+
+    output_dir.mkdir(parents=True, exist_ok=True)
+    started = time.time()
+
+    if mode in ("A2B", "BOTH"):
+        run_pass(folder_a, folder_b, output_dir, folder_a.name, folder_b.name)
+    if mode in ("B2A", "BOTH"):
+        run_pass(folder_b, folder_a, output_dir, folder_b.name, folder_a.name)
+
+    print(f"Done in {time.time() - started:.2f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,367 @@
+#!/usr/bin/env python3
+"""folder_line_compare.py -- per-target missing-line reports for two folders.
+
+For every source file, each non-empty line is tested against the line
+set of every target file; per source one report is written with a
+section per target listing the lines that target does not contain.  A
+per-pass summary CSV with the per-source missing counts is written by
+write_summary_files.
+
+MODE controls the direction:
+
+    A2B    files in folder A are sources, folder B holds the targets
+    B2A    the reverse
+    BOTH   run both passes
+
+Usage:
+    python folder_line_compare.py <folderA> <folderB> <output_dir> [A2B|B2A|BOTH]
+"""
+
+import csv
+import mmap
+import os
+import pickle
+import platform
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from pathlib import Path
+
+try:
+    import liburing
+except ImportError:  # thread-pool reads below are the fallback
+    liburing = None
+
+try:
+    from xxhash import xxh3_64_intdigest as _line_hash
+except ImportError:
+    import hashlib
+
+    def _line_hash(line: bytes) -> int:
+        return int.from_bytes(hashlib.blake2b(line, digest_size=8).digest(), "big")
+
+# io_uring batches many independent file reads into one syscall; only
+# available on Linux and only used when the liburing bindings import.
+_HAS_URING = liburing is not None and platform.system() == "Linux"
+
+MODE = "BOTH"
+NUM_WORKER_THREADS = 8
+
+# When True, targets with no missing lines are folded into one compact
+# footer line instead of each getting a three-line banner section —
+# on mostly-identical folders that is nearly all of the output.
+ONLY_DIFFERENCES = True
+
+# Report banners, hoisted so the per-target loop reuses two constants
+# instead of rebuilding the repeated strings for every section.
+EQ_BAR = "=" * 80 + "\n"
+DASH_BAR = "-" * 80 + "\n"
+
+# Pass-level target data for worker processes: the pool is created once
+# in main and shared by both passes, so each worker caches the pickled
+# (target_sets, present_everywhere) pair keyed by its path and reloads
+# only when a new pass hands it a different file.
+_TARGET_DATA = None
+_TARGET_DATA_PATH = None
+
+
+def _compare_task(source_path: Path, output_dir: Path, source_label: str,
+                  target_label: str, timestamp: str, target_data_path: str) -> dict:
+    global _TARGET_DATA, _TARGET_DATA_PATH
+    if target_data_path != _TARGET_DATA_PATH:
+        with open(target_data_path, "rb") as fh:
+            _TARGET_DATA = pickle.load(fh)
+        _TARGET_DATA_PATH = target_data_path
+    target_sets, present_everywhere = _TARGET_DATA
+    return compare_source_to_targets_and_write(source_path, target_sets,
+                                               present_everywhere, output_dir,
+                                               source_label, target_label, timestamp)
+
+
+def gather_text_files(folder: Path) -> list:
+    """Return the sorted list of .txt files directly inside *folder*.
+
+    Uses os.scandir so the file-type check comes from the cached dirent
+    instead of a stat per entry, and tests the name suffix directly
+    rather than going through Path.suffix.
+    """
+    with os.scandir(folder) as it:
+        entries = [e for e in it
+                   if e.is_file(follow_symlinks=False) and e.name.lower().endswith(".txt")]
+    return sorted(Path(e.path) for e in entries)
+
+
+def read_source_non_empty_lines_with_lineno(path: Path) -> tuple:
+    """Return (non_empty_count, line -> [original_line_no, ...]) for *path*.
+
+    The file is read in one shot and split with the C-level splitlines
+    (which also strips the terminators) instead of iterating the file
+    object line by line.  Lines stay as bytes — comparison is
+    byte-for-byte, so decoding every line would be wasted work; lines
+    are only decoded when written into a report.
+
+    Deduplicating straight into the occurrences map means repeated
+    lines cost one dict entry instead of one tuple per occurrence, and
+    every downstream stage iterates unique lines only.
+    """
+    count = 0
+    line_to_lns = {}
+    setdefault = line_to_lns.setdefault
+    for i, line in enumerate(path.read_bytes().splitlines(), 1):
+        if line.strip():
+            count += 1
+            setdefault(line, []).append(i)
+    return count, line_to_lns
+
+
+def _line_set_from_data(data: bytes) -> frozenset:
+    return frozenset(_line_hash(line) for line in data.splitlines() if line.strip())
+
+
+def build_target_line_set(path: Path) -> frozenset:
+    """Return the set of 64-bit line hashes occurring anywhere in *path*.
+
+    The file is memory-mapped so the kernel pages it in on demand and
+    the read goes through the page cache without an extra userspace
+    copy.  Storing fingerprints instead of the lines themselves shrinks
+    each set to ~8 bytes per entry and makes probes integer-cheap; at
+    64 bits the collision rate is negligible for these inputs, so a
+    hash hit is treated as a real hit.
+    """
+    if path.stat().st_size == 0:  # mmap rejects empty files
+        return frozenset()
+    with path.open("rb") as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return _line_set_from_data(mm[:])
+
+
+def _batch_read_bytes_uring(paths: list) -> list:
+    """Read every file in *paths* with one io_uring submission batch.
+
+    All reads are queued up front and submitted together, so the
+    per-file read syscall is amortized across the whole batch.  Every
+    completion is verified against the expected byte count — a failed
+    or short read raises OSError rather than letting a zero-filled
+    buffer feed the comparison, and the caller falls back to the
+    thread-pool reader.
+    """
+    if not paths:
+        return []
+    ring = liburing.io_uring()
+    cqe = liburing.io_uring_cqe()
+    liburing.io_uring_queue_init(len(paths), ring, 0)
+    fds = []
+    bufs = []
+    try:
+        for p in paths:
+            fd = os.open(os.fspath(p), os.O_RDONLY)
+            fds.append(fd)
+            bufs.append(bytearray(os.fstat(fd).st_size))
+        for i, (fd, buf) in enumerate(zip(fds, bufs)):
+            sqe = liburing.io_uring_get_sqe(ring)
+            liburing.io_uring_prep_read(sqe, fd, buf, len(buf), 0)
+            # Completions arrive in any order; tag each with its index
+            # so the result can be checked against the right buffer.
+            sqe.user_data = i
+        liburing.io_uring_submit(ring)
+        for _ in paths:
+            liburing.io_uring_wait_cqe(ring, cqe)
+            res = cqe.res
+            idx = cqe.user_data
+            liburing.io_uring_cqe_seen(ring, cqe)
+            if res < 0:
+                raise OSError(-res, os.strerror(-res), os.fspath(paths[idx]))
+            if res != len(bufs[idx]):
+                raise OSError(f"short read from {paths[idx]}: "
+                              f"{res} of {len(bufs[idx])} bytes")
+    finally:
+        for fd in fds:
+            os.close(fd)
+        liburing.io_uring_queue_exit(ring)
+    return [bytes(buf) for buf in bufs]
+
+
+def build_all_target_sets(target_files: list) -> list:
+    """Return [(target_path, line_set), ...] for the whole pass.
+
+    Uses the io_uring backend when available to batch the reads into a
+    single submission; otherwise overlaps them on an I/O thread pool.
+    """
+    if _HAS_URING:
+        try:
+            datas = _batch_read_bytes_uring(target_files)
+        except OSError:
+            datas = None
+        if datas is not None:
+            return [(tgt, _line_set_from_data(data))
+                    for tgt, data in zip(target_files, datas)]
+    with ThreadPoolExecutor(max_workers=min(32, max(1, len(target_files)))) as io_pool:
+        return list(zip(target_files,
+                        io_pool.map(build_target_line_set, target_files)))
+
+
+try:
+    from compare_ext import scan_diff as compare_source_to_target_missing
+except ImportError:
+    def compare_source_to_target_missing(candidate_set: set, candidate_entries: dict,
+                                         target_line_set: frozenset) -> list:
+        """Pure-Python fallback for the compiled scan (see compare_ext.pyx).
+
+        The membership filter runs as one C-level set difference over
+        64-bit line hashes instead of a per-line Python probe loop;
+        *candidate_entries* maps each hash back to its (line_no, line)
+        occurrences so duplicates are still reported per occurrence.
+        """
+        missing = []
+        for h in candidate_set - target_line_set:
+            missing.extend(candidate_entries[h])
+        missing.sort()
+        return missing
+
+
+def compare_source_to_targets_and_write(source_path: Path, target_sets: list,
+                                        present_everywhere: frozenset,
+                                        output_dir: Path, source_label: str,
+                                        target_label: str, timestamp: str) -> dict:
+    """Write one report comparing *source_path* against every target.
+
+    *target_sets* is the pass-level list of (target_path, line_set)
+    pairs, built once per pass by the driver and shared by every source
+    task, so each target file is read and hashed exactly once.
+
+    *present_everywhere* is the intersection of all target sets: a line
+    found there cannot be missing from any target, so the common
+    mostly-identical case is rejected with one probe instead of one per
+    target.
+    """
+    out_path = output_dir / f"{source_label}__{source_path.stem}__vs__{target_label}.missing.txt"
+    non_empty_count, line_to_lns = read_source_non_empty_lines_with_lineno(source_path)
+    # Hash each unique line once; lines whose fingerprint sits in every
+    # target are rejected here and never reach the per-target scans.
+    candidate_entries = {}
+    for line, lns in line_to_lns.items():
+        h = _line_hash(line)
+        if h not in present_everywhere:
+            candidate_entries[h] = [(orig_ln, line) for orig_ln in lns]
+    candidate_set = set(candidate_entries)
+    total_missing = 0
+    # Accumulate the whole report in memory and emit it with one write,
+    # instead of crossing the io layer per decoration and missing line.
+    parts = [f"Source file: {source_path.name}\n",
+             f"Generated: {timestamp}\n",
+             f"Non-empty lines: {non_empty_count}\n"]
+    append = parts.append
+    clean_targets = []
+    for tgt, tgt_set in target_sets:
+        missing = compare_source_to_target_missing(candidate_set, candidate_entries, tgt_set)
+        total_missing += len(missing)
+        if not missing:
+            if ONLY_DIFFERENCES:
+                clean_targets.append(tgt.name)
+                continue
+            append(f"{EQ_BAR}Target file: {tgt.name}\n{DASH_BAR}")
+            append("(no missing lines)\n")
+        else:
+            append(f"{EQ_BAR}Target file: {tgt.name}\n{DASH_BAR}")
+            parts.extend(f"src_ln={orig_ln}: {line.decode('utf-8', 'replace')}\n"
+                         for orig_ln, line in missing)
+    if clean_targets:
+        append(f"{EQ_BAR}Targets with no missing lines ({len(clean_targets)}): "
+               f"{', '.join(clean_targets)}\n")
+    out_path.write_text("".join(parts), encoding="utf-8")
+    return {"source": source_path.name, "total_missing": total_missing}
+
+
+def write_summary_files(all_counts: list, output_dir: Path,
+                        source_label: str, target_label: str, timestamp: str) -> None:
+    """Write the per-pass SOURCE_FILE,TOTAL_MISSING summary CSV."""
+    summary_path = output_dir / f"SUMMARY_{source_label}_vs_{target_label}.csv"
+    grand_total = sum(res["total_missing"] for res in all_counts)
+    with summary_path.open("w", encoding="utf-8", newline="") as s:
+        w = csv.writer(s)
+        w.writerow(["# generated", timestamp])
+        w.writerow(["SOURCE_FILE", "TOTAL_MISSING"])
+        for res in sorted(all_counts, key=lambda r: r["source"]):
+            w.writerow([res["source"], res["total_missing"]])
+        w.writerow(["GRAND_TOTAL", grand_total])
+
+
+def run_pass_and_collect_counts(source_folder: Path, target_folder: Path,
+                                output_dir: Path, source_label: str,
+                                target_label: str,
+                                pool: ProcessPoolExecutor) -> list:
+    """Run one full source-folder vs target-folder comparison pass on *pool*."""
+    # One timestamp for the whole pass: per-file strftime calls are not
+    # meaningful within a single run and would differ between workers.
+    timestamp = time.strftime("%Y-%m-%d %H:%M:%S")
+    source_files = gather_text_files(source_folder)
+    target_files = gather_text_files(target_folder)
+    print(f"[{source_label}->{target_label}] {len(source_files)} sources, "
+          f"{len(target_files)} targets")
+
+    # Build every target's line set exactly once for the whole pass,
+    # with the reads batched (io_uring) or overlapped (thread pool).
+    target_sets = build_all_target_sets(target_files)
+    # Lines present in every target can never show up in a missing
+    # section; the intersection lets each source reject them in one probe.
+    present_everywhere = (frozenset.intersection(*(s for _, s in target_sets))
+                          if target_sets else frozenset())
+
+    # The compare work is CPU-bound (hashing, set ops) and would serialize
+    # on the GIL under threads, so it runs on the shared process pool;
+    # the target data goes to each worker at most once per pass via the
+    # pickled temp file instead of being re-pickled per task.
+    with tempfile.NamedTemporaryFile(delete=False) as tmp:
+        pickle.dump((target_sets, present_everywhere), tmp,
+                    protocol=pickle.HIGHEST_PROTOCOL)
+        target_data_path = tmp.name
+
+    results = []
+    try:
+        futures = {
+            pool.submit(_compare_task, src, output_dir, source_label,
+                        target_label, timestamp, target_data_path): src
+            for src in source_files
+        }
+        for fut in as_completed(futures):
+            res = fut.result()
+            results.append(res)
+            print(f"  {res['source']}: {res['total_missing']} missing lines")
+    finally:
+        os.unlink(target_data_path)
+    return results
+
+
+def main(argv: list) -> int:
+    if len(argv) < 3:
+        print(__doc__)
+        return 2
+
+    folder_a = Path(argv[0])
+    folder_b = Path(argv[1])
+    output_dir = Path(argv[2])
+    mode = (argv[3] if len(argv) > 3 else MODE).upper()
+
+    output_dir.mkdir(parents=True, exist_ok=True)
+    started = time.time()
+    timestamp = time.strftime("%Y-%m-%d %H:%M:%S")
+
+    # One worker pool for the whole run: in BOTH mode the second pass
+    # reuses the warm processes instead of paying startup/teardown twice.
+    with ProcessPoolExecutor(max_workers=NUM_WORKER_THREADS) as pool:
+        if mode in ("A2B", "BOTH"):
+            counts = run_pass_and_collect_counts(folder_a, folder_b, output_dir,
+                                                 folder_a.name, folder_b.name, pool)
+            write_summary_files(counts, output_dir, folder_a.name, folder_b.name, timestamp)
+        if mode in ("B2A", "BOTH"):
+            counts = run_pass_and_collect_counts(folder_b, folder_a, output_dir,
+                                                 folder_b.name, folder_a.name, pool)
+            write_summary_files(counts, output_dir, folder_b.name, folder_a.name, timestamp)
+
+    print(f"Done in {time.time() - started:.2f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,1145 @@
+#!/usr/bin/env python3
+"""gtmdb_fis.py -- thin PEP-249-style wrapper for the FIS Profile/GT.M JDBC driver.
+
+Runs the vendor JDBC driver (ScJDBC.jar) inside an in-process JVM via
+JPype and exposes connections and cursors through jpype.dbapi2 (or
+jaydebeapi on older JPype), plus a callproc helper for stored
+procedures with OUT parameters, which neither backend's plain cursor
+supports.
+
+Usage:
+    conn = connect("jdbc:profile://host:port/db",
+                   "sanchez.jdbc.driver.ScDriver",
+                   "/opt/fis/lib/ScJDBC.jar",
+                   props={"user": "...", "password": "..."},
+                   jvm_args=["-Xmx512m"])
+    with conn:
+        cur = conn.cursor(row_format="dict")
+        cur.execute("SELECT * FROM PATIENT WHERE ID = ?", [42])
+        rows = cur.fetchall()
+        outs, results = conn.callproc("DOPOST", ["A", "B"], out_types=["VARCHAR"])
+"""
+
+import collections
+import decimal
+import functools
+import itertools
+import os
+import queue
+import threading
+import time
+
+import jpype
+from jpype import JArray, JClass, JInt
+
+try:
+    from jpype import dbapi2 as _jdbc
+except ImportError:  # JPype < 1.0: go through the jaydebeapi layer
+    _jdbc = None
+    import jaydebeapi
+
+try:
+    import pyarrow as pa
+except ImportError:  # fetchall_arrow/fetchall_df raise when missing
+    pa = None
+
+# Debug tracing, read from the environment once at import so the hot
+# paths test a plain module bool instead of re-doing the env lookup and
+# lower() per call; flip at runtime with _set_debug().
+_DEBUG = os.getenv("GTMDB_FIS_DEBUG", "0").lower() in ("1", "true", "yes")
+
+
+def _set_debug(on):
+    """Toggle debug tracing at runtime (the env var is only read at import)."""
+    global _DEBUG
+    _DEBUG = bool(on)
+
+
+# SQL type name -> CallableStatement getter used when reading OUT params.
+SQLTYPE_TO_GETTER = {
+    "VARCHAR": "getString",
+    "CHAR": "getString",
+    "LONGVARCHAR": "getString",
+    "INTEGER": "getInt",
+    "SMALLINT": "getShort",
+    "BIGINT": "getLong",
+    "NUMERIC": "getBigDecimal",
+    "DECIMAL": "getBigDecimal",
+    "DOUBLE": "getDouble",
+    "FLOAT": "getDouble",
+    "REAL": "getFloat",
+    "BOOLEAN": "getBoolean",
+    "DATE": "getDate",
+    "TIME": "getTime",
+    "TIMESTAMP": "getTimestamp",
+}
+
+# Optional Java-side helper (shipped in the site jar when available)
+# that reads all registered OUT parameters in one JNI crossing instead
+# of one getObject call per parameter.  Resolved lazily because JClass
+# needs a running JVM; False marks "looked up and absent".
+_OUT_BATCHER = None
+
+
+def _get_out_batcher():
+    global _OUT_BATCHER
+    if _OUT_BATCHER is None:
+        try:
+            _OUT_BATCHER = JClass("OutBatcher")
+        except Exception:
+            _OUT_BATCHER = False
+    return _OUT_BATCHER or None
+
+
+# Companion helper for result sets: pulls N rows per JNI crossing as an
+# Object[][] instead of one getObject call per cell.  Same lazy-lookup
+# contract as OutBatcher.
+_RS_BATCHER = None
+_RS_BATCH_ROWS = 1024
+
+
+def _get_rs_batcher():
+    global _RS_BATCHER
+    if _RS_BATCHER is None:
+        try:
+            _RS_BATCHER = JClass("ResultSetBatcher")
+        except Exception:
+            _RS_BATCHER = False
+    return _RS_BATCHER or None
+
+
+# Lazily built name -> java.sql.Types code map, so callproc does one
+# dict lookup per OUT parameter instead of a reflective JClass +
+# getattr round trip per call.  Needs a running JVM, hence not built
+# at import.
+_SQL_TYPE_CODES = None
+
+# Per-connection PreparedStatement cache bound; matches the common
+# driver-side MaxStatements=200 default.
+_PS_CACHE_MAX = 200
+
+# Rows the driver is asked to pull per network round-trip.  JDBC
+# defaults can be as low as 1-10 rows per trip, which makes wire
+# latency dominate large SELECTs; a batched hint amortizes it.
+_DEFAULT_FETCH_SIZE = int(os.getenv("GTMDB_FIS_FETCH_SIZE", "1000"))
+
+
+def _sql_type_codes():
+    global _SQL_TYPE_CODES
+    if _SQL_TYPE_CODES is None:
+        Types = JClass("java.sql.Types")
+        _SQL_TYPE_CODES = {name: int(getattr(Types, name))
+                           for name in dir(Types) if name.isupper()}
+    return _SQL_TYPE_CODES
+
+
+def _validate_and_collect_jars(driver_jar, classpath_extras=None):
+    """Return the absolute paths of every jar to put on the JVM classpath.
+
+    Pure for a given (driver_jar, extras) input, so the result is
+    memoized: repeat connects with the same classpath skip the path
+    expansion and existence checks entirely.  Failed validations are
+    not cached, so a missing jar can be fixed and retried.
+    """
+    return _validate_jars_cached(driver_jar, tuple(classpath_extras or ()))
+
+
+@functools.lru_cache(maxsize=16)
+def _validate_jars_cached(driver_jar, classpath_extras):
+    # Small classpaths are stat-checked directly; larger ones (callers
+    # passing a whole lib directory of jars) are grouped by parent
+    # directory and verified with one os.scandir per directory instead
+    # of one stat per jar.
+    all_paths = [driver_jar] + list(classpath_extras)
+    jars = [os.path.abspath(os.path.expanduser(os.path.expandvars(p)))
+            for p in all_paths]
+    if len(jars) <= 3:
+        for abs_path in jars:
+            if not os.path.isfile(abs_path):
+                raise FileNotFoundError(f"classpath jar not found: {abs_path}")
+        return tuple(jars)
+    present_by_dir = {}
+    for abs_path in jars:
+        parent = os.path.dirname(abs_path)
+        present = present_by_dir.get(parent)
+        if present is None:
+            try:
+                with os.scandir(parent) as it:
+                    present = {e.name for e in it if e.is_file()}
+            except OSError:
+                present = set()
+            present_by_dir[parent] = present
+        if os.path.basename(abs_path) not in present:
+            raise FileNotFoundError(f"classpath jar not found: {abs_path}")
+    return tuple(jars)
+
+
+# Set once the JVM is up so the steady-state _ensure_jvm is a plain
+# module-global test instead of a JNI isJVMStarted() crossing.
+_JVM_READY = False
+
+
+# Defaults tuned for short JDBC queries sharing a process with Python:
+# G1 with a tight pause target keeps multi-hundred-ms GC stalls out of
+# query p99, fewer JIT compiler threads stop the JVM stealing CPU from
+# the Python side, and small thread stacks cheapen the driver's
+# short-lived threads.  Caller-supplied jvm_args win over any of these
+# (matched per option, so passing -XX:MaxGCPauseMillis=50 replaces the
+# default pause target without dropping the rest).
+_DEFAULT_JVM_ARGS = ("-XX:+UseG1GC", "-XX:MaxGCPauseMillis=20",
+                     "-XX:CICompilerCount=2", "-Xss256k")
+
+
+def _jvm_arg_key(arg):
+    """The option identity of a JVM flag, ignoring its value: -XX:+UseG1GC
+    and -XX:-UseG1GC collide, as do -Xss256k and -Xss1m."""
+    if arg.startswith("-XX:"):
+        return "-XX:" + arg[4:].lstrip("+-").split("=", 1)[0]
+    if arg.startswith(("-Xss", "-Xmx", "-Xms", "-Xmn")):
+        return arg[:4]
+    return arg.split("=", 1)[0]
+
+
+def _merge_jvm_args(user_args):
+    """Layer *user_args* over _DEFAULT_JVM_ARGS, caller winning per option."""
+    user_keys = {_jvm_arg_key(a) for a in user_args}
+    merged = [a for a in _DEFAULT_JVM_ARGS if _jvm_arg_key(a) not in user_keys]
+    merged.extend(user_args)
+    return merged
+
+
+def _find_support_jar():
+    """Locate JPype's org.jpype.jar next to the installed package."""
+    support_jar = os.path.join(os.path.dirname(jpype.__file__), "org.jpype.jar")
+    return support_jar if os.path.isfile(support_jar) else None
+
+
+# Process-invariant, so resolved once at import instead of re-statting
+# the jpype install directory on every JVM start path.
+_JPYPE_SUPPORT_JAR = _find_support_jar()
+
+
+def _ensure_jvm(jars, jvm_args, suppress_jvm_gc_hook=True):
+    """Start the embedded JVM once, with JPype's support jar appended.
+
+    By default JPype's hook that triggers a Java GC on every CPython GC
+    cycle is disabled first — it roughly doubles the wall time of pure
+    Python code sharing the process with the JVM.  Pass
+    suppress_jvm_gc_hook=False to keep JPype's linked-GC behaviour.
+    """
+    global _JVM_READY
+    if _JVM_READY:
+        return
+    if jpype.isJVMStarted():
+        _JVM_READY = True
+        return
+    if _DEBUG:
+        print(f"[gtmdb_fis] starting JVM: classpath={jars} args={jvm_args}")
+    if suppress_jvm_gc_hook:
+        try:
+            jpype._jpype._collect = lambda *args, **kwargs: None
+        except AttributeError:
+            pass
+    classpath = list(jars)
+    if _JPYPE_SUPPORT_JAR is not None:
+        classpath.append(_JPYPE_SUPPORT_JAR)
+    jpype.startJVM(jpype.getDefaultJVMPath(), *jvm_args, classpath=classpath)
+    _JVM_READY = True
+
+
+def _jconn_of(raw):
+    """The underlying java.sql.Connection of a raw DB-API connection
+    (jpype.dbapi2 names it .connection, jaydebeapi .jconn)."""
+    return raw.connection if _jdbc is not None else raw.jconn
+
+
+def _open_raw(jdbc_url, driver_class, driver_jar, props,
+              classpath_extras, jvm_args, suppress_jvm_gc_hook):
+    """Open one raw DB-API connection, starting the JVM if needed.
+
+    jpype.dbapi2 talks to JDBC without the extra Python wrapper layer
+    jaydebeapi puts around every cursor call, so it is preferred when
+    present; the jaydebeapi path remains for JPype versions that do
+    not ship dbapi2.  Jar validation and JVM argument handling only
+    matter before the JVM exists, so once _JVM_READY is set a connect
+    is just the backend call — no filesystem checks, no list copies.
+    """
+    if not _JVM_READY:
+        jars = _validate_and_collect_jars(driver_jar, classpath_extras)
+        _ensure_jvm(jars, _merge_jvm_args(list(jvm_args or [])),
+                    suppress_jvm_gc_hook)
+    if _jdbc is not None:
+        return _jdbc.connect(jdbc_url, driver=driver_class,
+                             driver_args=dict(props or {}))
+    return jaydebeapi.connect(driver_class, jdbc_url, dict(props or {}))
+
+
+def connect(jdbc_url, driver_class, driver_jar, props=None,
+            classpath_extras=None, jvm_args=None, suppress_jvm_gc_hook=True):
+    """Open a JDBC connection and wrap it in a _Connection."""
+    raw = _open_raw(jdbc_url, driver_class, driver_jar, props,
+                    classpath_extras, jvm_args, suppress_jvm_gc_hook)
+    return _Connection(raw)
+
+
+class _Waiter:
+    """One parked acquire(): a releaser hands a connection straight over.
+
+    The handoff is claimable exactly once — a release() racing a
+    timed-out acquirer either loses (and keeps the connection for the
+    next taker) or wins before the cancellation lands, in which case
+    the acquirer sees the connection instead of timing out.  Without
+    that, a connection handed to a caller that already raised would be
+    stranded and its capacity lost for good.
+    """
+
+    __slots__ = ("event", "conn", "_lock", "_cancelled")
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.conn = None
+        self._lock = threading.Lock()
+        self._cancelled = False
+
+    def hand_over(self, raw):
+        """Give *raw* to the parked acquirer; False if it already gave up."""
+        with self._lock:
+            if self._cancelled:
+                return False
+            self.conn = raw
+            self.event.set()
+            return True
+
+    def wake_retry(self):
+        """Wake the parked acquirer without a connection — capacity was
+        freed by a drop and it should retry; False if it already gave up."""
+        with self._lock:
+            if self._cancelled:
+                return False
+            self.event.set()
+            return True
+
+    def cancel(self):
+        """Withdraw after a timeout; False when the waiter was already
+        woken — handed a connection (the caller must take self.conn)
+        or told to retry."""
+        with self._lock:
+            if self.event.is_set():
+                return False
+            self._cancelled = True
+            return True
+
+
+class GtmPool:
+    """Thread-safe pool of JDBC connections.
+
+    Opening a JDBC connection pays the full driver handshake plus JNI
+    setup, which dominates per-request cost under concurrent load.
+    Connections acquired from the pool return to an idle slot when
+    their _Connection is closed instead of closing the socket, so the
+    next acquire() reuses them.
+
+    Idle connections live in a fixed array of slots, each guarded by
+    its own lock taken with acquire(blocking=False) — checkout swaps a
+    slot without ever contending on one pool-wide lock.  When the pool
+    is at capacity, acquire() parks on a waiter queue and release()
+    hands the connection directly to the oldest waiter, bypassing the
+    slot array entirely.
+    """
+
+    def __init__(self, jdbc_url, driver_class, driver_jar, props=None,
+                 classpath_extras=None, jvm_args=None, max_size=25,
+                 suppress_jvm_gc_hook=True):
+        self._open_args = (jdbc_url, driver_class, driver_jar, props,
+                           classpath_extras, jvm_args, suppress_jvm_gc_hook)
+        self._max_size = max_size
+        self._slots = [None] * max_size
+        self._slot_locks = [threading.Lock() for _ in range(max_size)]
+        self._waiters = queue.SimpleQueue()
+        self._total = 0
+        self._total_lock = threading.Lock()
+
+    def _take_slot(self, i):
+        """Atomically take slot *i*'s connection; None if empty or contended."""
+        lock = self._slot_locks[i]
+        if not lock.acquire(blocking=False):
+            return None
+        try:
+            raw, self._slots[i] = self._slots[i], None
+            return raw
+        finally:
+            lock.release()
+
+    def _park_slot(self, i, raw):
+        """Atomically place *raw* into slot *i*; False if full or contended."""
+        lock = self._slot_locks[i]
+        if not lock.acquire(blocking=False):
+            return False
+        try:
+            if self._slots[i] is None:
+                self._slots[i] = raw
+                return True
+            return False
+        finally:
+            lock.release()
+
+    def _take_idle(self):
+        for i in range(self._max_size):
+            if self._slots[i] is not None:
+                raw = self._take_slot(i)
+                if raw is not None:
+                    return raw
+        return None
+
+    def _drop(self, raw):
+        with self._total_lock:
+            self._total -= 1
+        try:
+            raw.close()
+        except Exception:
+            pass
+        # The capacity this connection held is free again; wake one
+        # parked acquirer so it can open a replacement instead of
+        # waiting out its timeout (or forever) on a handoff that will
+        # never come.
+        self._notify_retry()
+
+    def _notify_retry(self):
+        while True:
+            try:
+                waiter = self._waiters.get_nowait()
+            except queue.Empty:
+                return
+            if waiter.wake_retry():
+                return
+
+    def acquire(self, timeout=None):
+        """Return a pooled _Connection, reusing an idle one when possible.
+
+        Blocks (up to *timeout* seconds) when max_size connections are
+        already checked out; raises TimeoutError on expiry.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            raw = self._take_idle()
+            while raw is not None:
+                # Cheap liveness probe; stale connections are discarded.
+                try:
+                    if _jconn_of(raw).isValid(1):
+                        return _Connection(raw, pool=self)
+                except Exception:
+                    pass
+                self._drop(raw)
+                raw = self._take_idle()
+            with self._total_lock:
+                can_open = self._total < self._max_size
+                if can_open:
+                    self._total += 1
+            if can_open:
+                try:
+                    return _Connection(_open_raw(*self._open_args), pool=self)
+                except Exception:
+                    with self._total_lock:
+                        self._total -= 1
+                    # The failed slot's capacity is free again; let a
+                    # parked acquirer retry rather than time out.
+                    self._notify_retry()
+                    raise
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                raise TimeoutError("no pooled connection became available")
+            waiter = _Waiter()
+            self._waiters.put(waiter)
+            if not waiter.event.wait(remaining) and waiter.cancel():
+                raise TimeoutError("no pooled connection became available")
+            if waiter.conn is not None:
+                # A release() handed its connection straight over
+                # (possibly beating the cancellation above).
+                return _Connection(waiter.conn, pool=self)
+            # Woken by a retry signal: capacity was freed by a drop, so
+            # loop back to grab an idle slot or open a fresh connection.
+
+    def release(self, raw):
+        """Return a raw connection to the pool.
+
+        A parked waiter gets it handed over directly; otherwise it goes
+        back into a free slot, or is closed if every slot is taken.
+        """
+        try:
+            # rollback() throws on an autocommit connection, and this
+            # module's autocommit setter makes that state routine — skip
+            # it rather than shedding a healthy connection every release.
+            if not _jconn_of(raw).getAutoCommit():
+                raw.rollback()
+        except Exception:
+            self._drop(raw)
+            return
+        while True:
+            try:
+                waiter = self._waiters.get_nowait()
+            except queue.Empty:
+                break
+            # Timed-out waiters stay queued until skipped here.
+            if waiter.hand_over(raw):
+                return
+        for i in range(self._max_size):
+            if self._slots[i] is None and self._park_slot(i, raw):
+                return
+        # Raced every slot away; shed the connection.
+        self._drop(raw)
+
+    def close(self):
+        """Close every idle connection."""
+        for i in range(self._max_size):
+            raw = self._take_slot(i)
+            if raw is not None:
+                self._drop(raw)
+
+
+# The java.lang.String[] array type, resolved through the classloader
+# once on first use instead of per marshalled sequence.  Lazy because
+# JClass needs a running JVM.
+_JSTRING_ARRAY = None
+
+
+def _jstring_array_type():
+    global _JSTRING_ARRAY
+    if _JSTRING_ARRAY is None:
+        _JSTRING_ARRAY = JArray(JClass("java.lang.String"))
+    return _JSTRING_ARRAY
+
+
+def _convert_py_sequence_to_jstring_array(seq):
+    """Marshal a Python sequence into a java.lang.String[] (ScJDBC pattern)."""
+    if _DEBUG:
+        print(f"[gtmdb_fis] marshalling {len(seq)} values into String[]")
+    # The @ operator hands the whole str list to JPype's bulk typed-array
+    # constructor: one Java-side allocation instead of a JString object
+    # and JNI crossing per element.
+    return _jstring_array_type() @ [None if x is None else str(x) for x in seq]
+
+
+# Coercion table for common boxed Java types, keyed by the concrete
+# JPype class so the per-cell dispatch is one type() dict probe.  The
+# hasattr() it replaces resolves attributes through Java reflection on
+# every value, which dominates wide result sets.  Lazy: JClass needs a
+# running JVM.
+_JAVA_COERCE = None
+
+
+def _java_coerce_table():
+    global _JAVA_COERCE
+    if _JAVA_COERCE is None:
+        table = {}
+        for class_name, conv in (
+                ("java.lang.String", str),
+                ("java.lang.Integer", int),
+                ("java.lang.Long", int),
+                ("java.lang.Short", int),
+                ("java.lang.Byte", int),
+                ("java.lang.Double", float),
+                ("java.lang.Float", float),
+                ("java.lang.Boolean", bool),
+                ("java.math.BigDecimal", lambda v: decimal.Decimal(str(v))),
+        ):
+            try:
+                table[JClass(class_name)] = conv
+            except Exception:
+                pass
+        _JAVA_COERCE = table
+    return _JAVA_COERCE
+
+
+def _java_to_python(jobj):
+    """Coerce one Java value returned over JNI into a Python object."""
+    if jobj is None:
+        return None
+    if isinstance(jobj, (bool, int, float, str, bytes)):
+        return jobj
+    table = _JAVA_COERCE
+    if table is None:
+        table = _java_coerce_table()
+    conv = table.get(type(jobj))
+    if conv is not None:
+        return conv(jobj)
+    # Temporal and vendor types fall through to their string form, as
+    # before.
+    if hasattr(jobj, "toString"):
+        return str(jobj.toString())
+    return jobj
+
+
+def _fetch_rows(rs, col_count, limit):
+    """Pull up to *limit* rows (all when None) from *rs* as Python tuples.
+
+    Returning fewer than *limit* rows means the result set is
+    exhausted.  Goes through the Java-side batcher when available, so
+    a JNI crossing covers a batch of rows instead of one cell.
+    """
+    rows = []
+    batcher = _get_rs_batcher()
+    if batcher is not None:
+        while True:
+            want = _RS_BATCH_ROWS if limit is None \
+                else min(_RS_BATCH_ROWS, limit - len(rows))
+            if want <= 0:
+                break
+            batch = batcher.fetchBatch(rs, want, col_count)
+            n = len(batch)
+            if not n:
+                break
+            rows.extend(tuple(_java_to_python(v) for v in jrow) for jrow in batch)
+            if n < want:
+                break
+        return rows
+    # Bound method and index range hoisted so the per-row loop carries
+    # no repeated attribute resolution on the JPype proxy.
+    get_object = rs.getObject
+    col_range = range(1, col_count + 1)
+    while (limit is None or len(rows) < limit) and rs.next():
+        rows.append(tuple(_java_to_python(get_object(i)) for i in col_range))
+    return rows
+
+
+def _resultset_columns(rs):
+    """Return (column_names, column_count) for a java.sql.ResultSet."""
+    md = rs.getMetaData()
+    col_count = int(md.getColumnCount())
+    col_names = [str(md.getColumnLabel(i) or md.getColumnName(i))
+                 for i in range(1, col_count + 1)]
+    return col_names, col_count
+
+
+def _resultset_to_python(rs):
+    """Drain a java.sql.ResultSet into (column_names, rows)."""
+    # Hint the batched fetch size up front; some drivers reject the
+    # hint (or an already-started cursor), which is fine to ignore.
+    try:
+        rs.setFetchSize(_DEFAULT_FETCH_SIZE)
+    except Exception:
+        pass
+    col_names, col_count = _resultset_columns(rs)
+    return col_names, _fetch_rows(rs, col_count, None)
+
+
+@functools.lru_cache(maxsize=64)
+def _row_type(colnames):
+    """Named row type for a column tuple; cached because creating a
+    namedtuple class is far more expensive than instantiating one."""
+    return collections.namedtuple("Row", colnames, rename=True)
+
+
+class _Cursor:
+    """Cursor shim over the backend DB-API cursor, with dict-row helpers.
+
+    Plain fetches return named rows (a tuple subclass, so positional
+    access is unchanged and columns are also reachable by name).
+    Iterating the cursor fetches arraysize rows at a time under the
+    hood, so `for row in cur` never pays a per-row fetchone call.
+    """
+
+    # Slotted: a pool can hold thousands of live cursors, and dropping
+    # the per-instance __dict__ shrinks each one and speeds up the
+    # self._cur / self._row_factory loads in the fetch hot loops.
+    __slots__ = ("arraysize", "_cur", "_conn", "_closed", "_colnames",
+                 "_row_factory", "_fetch_size", "_buffer", "_rs",
+                 "_rs_cols", "_rs_sql", "_direct_description",
+                 "_direct_rowcount")
+
+    def __init__(self, cur, conn=None):
+        self._cur = cur
+        self._conn = conn
+        self._closed = False
+        # PEP-249 read/write attribute; slotted so per-cursor tuning
+        # still works now that the class has no instance dict.
+        self.arraysize = 1000
+        self._colnames = ()
+        self._row_factory = tuple
+        self._fetch_size = _DEFAULT_FETCH_SIZE
+        # Set when execute ran through the cached-PreparedStatement fast
+        # path: already-fetched rows waiting to be handed out, the live
+        # ResultSet they stream from (None once exhausted), and the
+        # metadata the underlying backend cursor never saw.
+        self._buffer = None
+        self._rs = None
+        self._rs_cols = 0
+        self._rs_sql = None
+        self._direct_description = None
+        self._direct_rowcount = -1
+
+    @property
+    def description(self):
+        if self._direct_description is not None:
+            return self._direct_description
+        return self._cur.description
+
+    @property
+    def rowcount(self):
+        if self._buffer is not None:
+            return self._direct_rowcount
+        return self._cur.rowcount
+
+    def columns(self):
+        """Return the column names of the current result set."""
+        return list(self._colnames)
+
+    def set_fetch_size(self, n):
+        """Hint the driver to pull *n* rows per network round-trip.
+
+        Takes effect on subsequent statements; also applied to the
+        statement's open ResultSet when one is reachable.
+        """
+        self._fetch_size = n
+        self._apply_fetch_size()
+
+    def _apply_fetch_size(self):
+        # The prepared fast path owns its ResultSet directly; the
+        # backend keeps its own private (_rs in jaydebeapi, _resultSet
+        # in jpype.dbapi2), so that side is best-effort.
+        rs = self._rs or getattr(self._cur, "_rs", None) or \
+            getattr(self._cur, "_resultSet", None)
+        if rs is not None:
+            try:
+                rs.setFetchSize(self._fetch_size)
+            except Exception:
+                pass
+
+    def _close_direct_rs(self):
+        rs = self._rs
+        if rs is not None:
+            self._rs = None
+            if self._conn is not None:
+                owners = self._conn._ps_owners
+                if owners.get(self._rs_sql) is self:
+                    del owners[self._rs_sql]
+            self._rs_sql = None
+            try:
+                rs.close()
+            except Exception:
+                pass
+
+    def _absorb_direct_rs(self):
+        """Buffer every remaining row of the live ResultSet and close it.
+
+        Called by the connection before this cursor's PreparedStatement
+        is re-executed by another cursor or evicted from the cache —
+        JDBC implicitly closes the statement's current ResultSet in
+        both cases, which would otherwise break this cursor mid-fetch.
+        """
+        if self._rs is not None:
+            self._refill_buffer(None)
+
+    def _refresh_colnames(self):
+        # Cached once per execution so the per-row dict fetches and
+        # columns() never re-walk the description; the row factory is
+        # bound here too so the fetch loops carry no per-row decisions.
+        self._colnames = tuple(d[0] for d in (self._cur.description or ()))
+        self._row_factory = _row_type(self._colnames)._make if self._colnames else tuple
+
+    def execute(self, operation, parameters=None):
+        """Execute a statement; parameterized statements reuse a cached
+        java.sql.PreparedStatement so the server parses each SQL text
+        once per connection instead of once per call."""
+        if parameters is not None and self._conn is not None:
+            return self._execute_prepared(operation, parameters)
+        self._close_direct_rs()
+        self._buffer = None
+        self._direct_description = None
+        if parameters is None:
+            self._cur.execute(operation)
+        else:
+            self._cur.execute(operation, list(parameters))
+        self._apply_fetch_size()
+        self._refresh_colnames()
+        return self
+
+    def _execute_prepared(self, operation, parameters):
+        self._close_direct_rs()
+        ps = self._conn._prepared(operation)
+        ps.clearParameters()
+        for i, value in enumerate(parameters):
+            ps.setObject(i + 1, value)
+        if ps.execute():
+            # The ResultSet stays open and rows stream into the buffer
+            # in _fetch_size batches as the fetch methods ask for them,
+            # so fetchone() on a huge result neither drains nor holds
+            # the whole thing.  Closed on exhaustion, re-execute or
+            # cursor close.
+            rs = ps.getResultSet()
+            try:
+                rs.setFetchSize(self._fetch_size)
+            except Exception:
+                pass
+            col_names, self._rs_cols = _resultset_columns(rs)
+            self._rs = rs
+            self._rs_sql = operation
+            self._conn._ps_owners[operation] = self
+            self._buffer = collections.deque()
+            self._direct_description = [(name, None, None, None, None, None, None)
+                                        for name in col_names]
+            self._direct_rowcount = -1
+            self._colnames = tuple(col_names)
+            self._row_factory = _row_type(self._colnames)._make if col_names else tuple
+        else:
+            self._buffer = collections.deque()
+            self._direct_description = None
+            self._direct_rowcount = int(ps.getUpdateCount())
+            self._colnames = ()
+            self._row_factory = tuple
+        return self
+
+    def executemany(self, operation, seq_of_parameters, batch_size=1000):
+        """Execute *operation* once per parameter row.
+
+        Rows go through JDBC addBatch/executeBatch on the cached
+        PreparedStatement, so *batch_size* rows cost one round-trip
+        instead of one per row; batching also bounds peak memory on
+        very large inputs.  Without a parent connection the rows fall
+        back to the backend's executemany in the same sized chunks.
+        """
+        if self._conn is not None:
+            return self._executemany_batched(operation, seq_of_parameters, batch_size)
+        self._close_direct_rs()
+        self._buffer = None
+        self._direct_description = None
+        it = iter(seq_of_parameters)
+        while True:
+            chunk = list(map(tuple, itertools.islice(it, batch_size)))
+            if not chunk:
+                break
+            self._cur.executemany(operation, chunk)
+        self._refresh_colnames()
+        return self
+
+    def _executemany_batched(self, operation, seq_of_parameters, batch_size):
+        self._close_direct_rs()
+        ps = self._conn._prepared(operation)
+        jconn = self._conn._jconn
+        autocommit = bool(jconn.getAutoCommit())
+        total = 0
+        it = iter(seq_of_parameters)
+        while True:
+            chunk = list(itertools.islice(it, batch_size))
+            if not chunk:
+                break
+            for row in chunk:
+                ps.clearParameters()
+                for i, value in enumerate(row):
+                    ps.setObject(i + 1, value)
+                ps.addBatch()
+            counts = ps.executeBatch()
+            if not autocommit:
+                jconn.commit()
+            total += sum(int(c) for c in counts if int(c) >= 0)
+        self._buffer = collections.deque()
+        self._direct_description = None
+        self._direct_rowcount = total
+        self._colnames = ()
+        self._row_factory = tuple
+        return self
+
+    def _refill_buffer(self, want):
+        # Stream the next batch from the live ResultSet; a short batch
+        # means it is exhausted and can be closed.
+        got = _fetch_rows(self._rs, self._rs_cols, want)
+        self._buffer.extend(got)
+        if want is None or len(got) < want:
+            self._close_direct_rs()
+
+    def _take_buffered(self, size):
+        buf = self._buffer
+        if size is None:
+            if self._rs is not None:
+                self._refill_buffer(None)
+            rows = list(buf)
+            buf.clear()
+            return rows
+        if len(buf) < size and self._rs is not None:
+            self._refill_buffer(max(size - len(buf), self._fetch_size))
+        if size >= len(buf):
+            rows = list(buf)
+            buf.clear()
+        else:
+            rows = [buf.popleft() for _ in range(size)]
+        return rows
+
+    def _next_buffered(self):
+        buf = self._buffer
+        if not buf and self._rs is not None:
+            self._refill_buffer(self._fetch_size)
+        return buf.popleft() if buf else None
+
+    def fetchone(self):
+        if self._buffer is not None:
+            row = self._next_buffered()
+        else:
+            row = self._cur.fetchone()
+        return self._row_factory(row) if row is not None else None
+
+    def fetchmany(self, size=None):
+        if self._buffer is not None:
+            rows = self._take_buffered(size or self.arraysize)
+        else:
+            rows = self._cur.fetchmany(size or self.arraysize)
+        # map over the bound factory converts the rows in one C-level loop.
+        return list(map(self._row_factory, rows))
+
+    def fetchall(self):
+        rows = self._take_buffered(None) if self._buffer is not None \
+            else self._cur.fetchall()
+        return list(map(self._row_factory, rows))
+
+    def fetchone_dict(self):
+        if self._buffer is not None:
+            row = self._next_buffered()
+        else:
+            row = self._cur.fetchone()
+        if row is None:
+            return None
+        return dict(zip(self._colnames, row))
+
+    def fetchmany_dict(self, size=None):
+        if self._buffer is not None:
+            rows = self._take_buffered(size or self.arraysize)
+        else:
+            rows = self._cur.fetchmany(size or self.arraysize)
+        cols = self._colnames
+        return [dict(zip(cols, r)) for r in rows]
+
+    def fetchall_dict(self):
+        rows = self._take_buffered(None) if self._buffer is not None \
+            else self._cur.fetchall()
+        cols = self._colnames
+        return [dict(zip(cols, r)) for r in rows]
+
+    def __iter__(self):
+        """Yield rows in arraysize batches rather than one fetch per row."""
+        fetchmany = self.fetchmany
+        size = self.arraysize or 1000
+        while True:
+            batch = fetchmany(size)
+            if not batch:
+                return
+            yield from batch
+
+    def fetchall_columnar(self):
+        """Return the remaining rows as {column_name: [values, ...]}.
+
+        One zip(*rows) transposes the whole result in C, so analytics
+        consumers get Arrow/pandas-friendly columns without a Python
+        dict per row.
+        """
+        rows = self._take_buffered(None) if self._buffer is not None \
+            else self._cur.fetchall()
+        cols = self._colnames
+        if not rows:
+            return {name: [] for name in cols}
+        return dict(zip(cols, map(list, zip(*rows))))
+
+    def fetchall_arrow(self):
+        """Return the remaining rows as a pyarrow.RecordBatch.
+
+        Built on top of fetchall_columnar, so each value lands in a
+        typed Arrow column straight from the transpose instead of first
+        living in a per-row Python tuple and then being re-walked by
+        the DataFrame constructor.  Requires pyarrow.
+        """
+        if pa is None:
+            raise RuntimeError("pyarrow is required for fetchall_arrow()")
+        columns = self.fetchall_columnar()
+        return pa.RecordBatch.from_arrays(
+            [pa.array(values) for values in columns.values()],
+            names=list(columns))
+
+    def fetchall_df(self):
+        """Return the remaining rows as a pandas DataFrame, via Arrow."""
+        return self.fetchall_arrow().to_pandas()
+
+    def close(self):
+        if not self._closed:
+            self._close_direct_rs()
+            self._cur.close()
+            self._closed = True
+
+
+class _DictCursor(_Cursor):
+    """Cursor whose plain fetches return dict rows keyed by column name.
+
+    Chosen at construction time by cursor(row_format="dict"), so the
+    per-row method lookup stays on the class and keeps CPython's
+    method cache warm — no per-instance rebinding.
+    """
+
+    __slots__ = ()
+
+    fetchone = _Cursor.fetchone_dict
+    fetchmany = _Cursor.fetchmany_dict
+    fetchall = _Cursor.fetchall_dict
+
+
+class _Connection:
+    """Connection shim adding callproc, dict cursors, and context management."""
+
+    __slots__ = ("_c", "_jconn", "_closed", "_pool", "_ps_cache",
+                 "_ps_owners", "_get_autocommit", "_set_autocommit")
+
+    def __init__(self, raw, pool=None):
+        self._c = raw
+        self._jconn = _jconn_of(raw)
+        self._closed = False
+        self._pool = pool
+        self._ps_cache = collections.OrderedDict()
+        # sql -> cursor currently streaming from that statement's open
+        # ResultSet; consulted before a statement is re-executed or
+        # evicted, since JDBC closes the ResultSet under the streamer.
+        self._ps_owners = {}
+        # Bound once so the autocommit property and __exit__ skip the
+        # per-access JPype proxy method resolution.
+        self._get_autocommit = self._jconn.getAutoCommit
+        self._set_autocommit = self._jconn.setAutoCommit
+
+    def _yield_statement(self, sql):
+        # A cursor still streaming from this statement's ResultSet must
+        # buffer its remaining rows before the statement is reused or
+        # closed, or its next refill would read a dead ResultSet.
+        owner = self._ps_owners.pop(sql, None)
+        if owner is not None:
+            owner._absorb_direct_rs()
+
+    def _prepared(self, sql):
+        """Cached java.sql.PreparedStatement for *sql*, LRU-bounded."""
+        cache = self._ps_cache
+        ps = cache.get(sql)
+        if ps is None:
+            ps = self._jconn.prepareStatement(sql)
+            cache[sql] = ps
+            if len(cache) > _PS_CACHE_MAX:
+                old_sql, old_ps = cache.popitem(last=False)
+                self._yield_statement(old_sql)
+                try:
+                    old_ps.close()
+                except Exception:
+                    pass
+        else:
+            cache.move_to_end(sql)
+            self._yield_statement(sql)
+        return ps
+
+    def cursor(self, row_format=None, fetch_size=None):
+        """Return a cursor; row_format="dict" makes the fetch methods
+        return dict rows keyed by column name, and *fetch_size*
+        overrides the per-round-trip row count hinted to the driver."""
+        cls = _DictCursor if row_format == "dict" else _Cursor
+        cur = cls(self._c.cursor(), self)
+        if fetch_size is not None:
+            cur._fetch_size = fetch_size
+        return cur
+
+    @property
+    def autocommit(self):
+        return bool(self._get_autocommit())
+
+    @autocommit.setter
+    def autocommit(self, on):
+        self._set_autocommit(bool(on))
+
+    def callproc(self, procname, parameters=(), out_types=()):
+        """Call a stored procedure and return (out_values, results).
+
+        *parameters* are bound as IN parameters in order; *out_types*
+        names the SQL types (e.g. "VARCHAR") of the trailing OUT
+        parameters.  *results* is the (col_names, rows) of the first
+        result set, or [] when the procedure returns none.
+        """
+        type_codes = _sql_type_codes()
+        total_params = len(parameters) + len(out_types)
+        placeholders = ", ".join(["?"] * total_params)
+        cstmt = self._jconn.prepareCall(f"{{call {procname}({placeholders})}}")
+        try:
+            for i, value in enumerate(parameters):
+                if _DEBUG:
+                    print(f"[gtmdb_fis] {procname} IN {i + 1} = {value!r}")
+                cstmt.setObject(i + 1, value)
+            out_indexes = []
+            out_typenames = []
+            for j, tname in enumerate(out_types):
+                idx = len(parameters) + j + 1
+                tname = (tname or "VARCHAR").upper()
+                try:
+                    code = type_codes[tname]
+                except KeyError:
+                    raise ValueError(f"unknown SQL type: {tname}") from None
+                cstmt.registerOutParameter(idx, code)
+                out_indexes.append(idx)
+                out_typenames.append(tname)
+
+            has_rs = cstmt.execute()
+            results = []
+            if has_rs:
+                rs = cstmt.getResultSet()
+                try:
+                    results = _resultset_to_python(rs)
+                finally:
+                    rs.close()
+
+            # Read every OUT value in one JNI crossing when the Java-side
+            # batcher is on the classpath; otherwise fall back to one
+            # getObject call per parameter.
+            out_values = []
+            if out_indexes:
+                batcher = _get_out_batcher()
+                if batcher is not None:
+                    raw_values = batcher.getAll(cstmt, JArray(JInt)(out_indexes))
+                    out_values = [_java_to_python(v) for v in raw_values]
+                else:
+                    # Typed getters resolved once up front: each getattr
+                    # on the JPype proxy is a reflective lookup, so the
+                    # read loop only pays the call itself per parameter.
+                    getters = [getattr(cstmt,
+                                       SQLTYPE_TO_GETTER.get(tname, "getObject"))
+                               for tname in out_typenames]
+                    for idx, getter in zip(out_indexes, getters):
+                        if _DEBUG:
+                            print(f"[gtmdb_fis] {procname} OUT {idx}")
+                        value = getter(idx)
+                        if value is not None and cstmt.wasNull():
+                            value = None
+                        out_values.append(_java_to_python(value))
+            return out_values, results
+        finally:
+            cstmt.close()
+
+    def commit(self):
+        self._c.commit()
+
+    def rollback(self):
+        self._c.rollback()
+
+    def close(self):
+        if not self._closed:
+            for ps in self._ps_cache.values():
+                try:
+                    ps.close()
+                except Exception:
+                    pass
+            self._ps_cache.clear()
+            self._ps_owners.clear()
+            if self._pool is not None:
+                self._pool.release(self._c)
+            else:
+                self._c.close()
+            self._closed = True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        try:
+            autocommit = bool(self._get_autocommit())
+            if exc_type is None:
+                if not autocommit:
+                    self.commit()
+            elif not autocommit:
+                self.rollback()
+        finally:
+            self.close()
@@ -0,0 +1,317 @@
+#!/usr/bin/env python3
+"""missing_lines_report.py -- report source lines missing from target files.
+
+For every source file, each non-empty line is checked against the line
+set of every target file; lines a target does not contain anywhere are
+listed in a per-source detailed report.  Per source file one output is
+written into the output folder:
+
+    <src>.missing.txt       per-target sections of missing lines,
+                            followed by a # COUNTS footer with the
+                            per-target counts and a TOTAL line
+
+plus one overall summary per pass:
+
+    SUMMARY_<src_label>_vs_<tgt_label>.csv
+
+MODE controls the direction:
+
+    A2B    files in folder A are sources, folder B holds the targets
+    B2A    the reverse
+    BOTH   run both passes
+
+Usage:
+    python missing_lines_report.py <folderA> <folderB> <output_dir> [A2B|B2A|BOTH]
+"""
+
+import csv
+import hashlib
+import mmap
+import os
+import pickle
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from pathlib import Path
+
+try:
+    from xxhash import xxh3_64_intdigest as _line_hash
+except ImportError:
+    def _line_hash(line: bytes) -> int:
+        return int.from_bytes(hashlib.blake2b(line, digest_size=8).digest(), "big")
+
+try:
+    import polars as pl
+except ImportError:  # per-line hashing below is the fallback
+    pl = None
+
+
+def _hash_lines(lines: list) -> list:
+    """Fingerprint a list of byte lines, vectorized when polars is there.
+
+    polars hashes the whole column in native code in one call, skipping
+    the per-line Python dispatch.  Target and source sides both go
+    through this helper, so fingerprints always come from the same
+    function and stay comparable.
+    """
+    if pl is not None and lines:
+        return pl.Series(lines).hash().to_list()
+    return [_line_hash(line) for line in lines]
+
+try:
+    from compare_ext import scan_missing as _scan_missing
+except ImportError:
+    def _scan_missing(hashes: list, presence: dict, all_mask: int) -> list:
+        """Pure-Python fallback for the compiled scan (see compare_ext.pyx)."""
+        result = []
+        append = result.append
+        get = presence.get
+        for i, h in enumerate(hashes):
+            miss = ~get(h, 0) & all_mask
+            if miss:
+                append((i, miss))
+        return result
+
+MODE = "BOTH"
+NUM_WORKER_THREADS = 8
+# Thread count for the target-read stage; reads release the GIL, so
+# this is tuned to storage parallelism, independent of the CPU pool.
+NUM_IO_THREADS = 16
+
+# When False, the per-target detail sections are skipped and the
+# .missing.txt holds only the # COUNTS footer — much faster on
+# missing-heavy runs where consumers only read the counts.
+WRITE_DETAILED = True
+
+# Presence index shared with worker processes: each worker loads the
+# pickled index once, in the pool initializer, so per-task submissions
+# only ship a source path.
+_PRESENCE_INDEX = None
+
+
+def _init_worker(presence_index_pickle_path: str) -> None:
+    global _PRESENCE_INDEX
+    # The pickled index can be tens of MB; a 1 MB buffer keeps the load
+    # from issuing default-buffer-sized read syscalls.
+    with open(presence_index_pickle_path, "rb", buffering=1 << 20) as fh:
+        _PRESENCE_INDEX = pickle.load(fh)
+
+
+def _compare_task(source_path: Path, output_dir: Path,
+                  source_label: str, target_label: str) -> dict:
+    return compare_source_to_targets_and_write(source_path, _PRESENCE_INDEX, output_dir,
+                                               source_label, target_label)
+
+
+def gather_text_files(folder: Path) -> list:
+    """Return the sorted list of .txt files directly inside *folder*.
+
+    Uses os.scandir so the file-type check comes from the cached dirent
+    instead of a stat per entry.
+    """
+    with os.scandir(folder) as it:
+        entries = [e for e in it
+                   if e.is_file(follow_symlinks=False) and e.name.lower().endswith(".txt")]
+    return sorted(Path(e.path) for e in entries)
+
+
+def read_source_non_empty_lines_with_lineno(path: Path) -> list:
+    """Return [(original_line_no, line), ...] for the non-empty lines of *path*.
+
+    The file is read in one shot and split with the C-level splitlines
+    instead of iterating the file object line by line.  Lines stay as
+    bytes — comparison is byte-for-byte, so decoding every line would be
+    wasted work; lines are only decoded when written into a report.
+    """
+    lines = path.read_bytes().splitlines()
+    # line.isspace() tests emptiness without the throwaway allocation a
+    # strip() would make for every whitespace-only line.
+    return [(i, line) for i, line in enumerate(lines, 1) if line and not line.isspace()]
+
+
+class PresenceIndex:
+    """Inverted index over the targets of one pass.
+
+    presence maps each 64-bit line fingerprint to an int bitmask whose
+    bit k is set when target k contains the line, so "which targets miss
+    this line" is one dict lookup and a mask invert instead of an O(M)
+    per-target probe loop.  Python ints keep this exact past 64 targets.
+    """
+
+    __slots__ = ("names", "presence", "all_mask")
+
+    def __init__(self, names: list, presence: dict):
+        self.names = names
+        self.presence = presence
+        self.all_mask = (1 << len(names)) - 1
+
+
+def build_target_line_set(path: Path) -> set:
+    """Return the set of 64-bit line hashes occurring anywhere in *path*.
+
+    The file is memory-mapped and split once.  Storing fingerprints
+    instead of the line bytes shrinks the set to ~8 bytes per entry and
+    makes membership probes integer-cheap; at 64 bits the collision
+    rate is negligible for these inputs, so a hash hit is treated as a
+    real hit.
+    """
+    if path.stat().st_size == 0:
+        return set()
+    with path.open("rb") as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            lines = [line for line in mm[:].splitlines() if line and not line.isspace()]
+    return set(_hash_lines(lines))
+
+
+def compare_source_to_targets_and_write(source_path: Path, presence_index: PresenceIndex,
+                                        output_dir: Path, source_label: str,
+                                        target_label: str) -> dict:
+    """Compare one source against every target via the presence index.
+
+    One pass over the source's unique lines resolves, per line, every
+    target that misses it (a dict lookup plus bitmask decode), so the
+    per-target missing lists are materialized once instead of M times.
+    """
+    source_lines = read_source_non_empty_lines_with_lineno(source_path)
+    line_to_lns = {}
+    for orig_ln, line in source_lines:
+        line_to_lns.setdefault(line, []).append(orig_ln)
+    uniq_lines = list(line_to_lns)
+    hashes = _hash_lines(uniq_lines)
+
+    names = presence_index.names
+    presence = presence_index.presence
+    all_mask = presence_index.all_mask
+
+    detailed = WRITE_DETAILED
+    per_target_missing = [[] for _ in names] if detailed else None
+    counts = [0] * len(names)
+    missing_entries = _scan_missing(hashes, presence, all_mask)
+    for i, miss in missing_entries:
+        line = uniq_lines[i]
+        occurrences = line_to_lns[line]
+        while miss:
+            k = (miss & -miss).bit_length() - 1
+            counts[k] += len(occurrences)
+            if detailed:
+                per_target_missing[k].extend((ln, line) for ln in occurrences)
+            miss &= miss - 1
+
+    stem = f"{source_label}__{source_path.stem}__vs__{target_label}"
+    out_path = output_dir / f"{stem}.missing.txt"
+
+    total_missing = sum(counts)
+    # One report per source: the detail sections (when enabled) followed
+    # by a # COUNTS footer, so a single open/write/close covers what used
+    # to take three files.
+    parts = [f"Source file: {source_path.name}\n",
+             f"Non-empty lines: {len(source_lines)}\n"]
+    append = parts.append
+    if detailed:
+        if not missing_entries:
+            # Every line is present in every target: emit the all-clear
+            # sections from one template instead of walking M empty lists.
+            zero_section = "=" * 80 + "\nTarget file: %s\n" + "-" * 80 + \
+                "\n(no missing lines)\n"
+            parts.extend(zero_section % tgt_name for tgt_name in names)
+        else:
+            for tgt_name, missing in zip(names, per_target_missing):
+                missing.sort()
+                append("=" * 80 + "\n")
+                append(f"Target file: {tgt_name}\n")
+                append("-" * 80 + "\n")
+                if not missing:
+                    append("(no missing lines)\n")
+                else:
+                    parts.extend(f"src_ln={orig_ln}: {line.decode('utf-8', 'replace')}\n"
+                                 for orig_ln, line in missing)
+    append("# COUNTS\n")
+    parts.extend(f"{tgt_name},{count}\n" for tgt_name, count in zip(names, counts))
+    append(f"TOTAL: {total_missing}\n")
+    out_path.write_text("".join(parts), encoding="utf-8")
+
+    return {"source": source_path.name, "total_missing": total_missing}
+
+
+def run_pass(source_folder: Path, target_folder: Path, output_dir: Path,
+             source_label: str, target_label: str, threads: int = NUM_WORKER_THREADS) -> list:
+    """Run one full source-folder vs target-folder comparison pass."""
+    source_files = gather_text_files(source_folder)
+    target_files = gather_text_files(target_folder)
+    print(f"[{source_label}->{target_label}] {len(source_files)} sources, "
+          f"{len(target_files)} targets")
+
+    # Build the inverted presence index exactly once for the whole pass;
+    # target files are read/hashed concurrently on a dedicated I/O pool.
+    with ThreadPoolExecutor(max_workers=min(NUM_IO_THREADS, max(1, len(target_files)))) as io_ex:
+        target_hash_sets = list(io_ex.map(build_target_line_set, target_files))
+    presence = {}
+    for k, hashes in enumerate(target_hash_sets):
+        bit = 1 << k
+        for h in hashes:
+            presence[h] = presence.get(h, 0) | bit
+    presence_index = PresenceIndex([t.name for t in target_files], presence)
+
+    # The set hashing and comparison work is CPU-bound, so the pass runs
+    # on processes; the index goes to each worker once via the initializer.
+    with tempfile.NamedTemporaryFile(delete=False) as tmp:
+        pickle.dump(presence_index, tmp, protocol=pickle.HIGHEST_PROTOCOL)
+        target_sets_path = tmp.name
+
+    results = []
+    try:
+        with ProcessPoolExecutor(max_workers=threads, initializer=_init_worker,
+                                 initargs=(target_sets_path,)) as ex:
+            futures = {
+                ex.submit(_compare_task, src, output_dir, source_label, target_label): src
+                for src in source_files
+            }
+            for fut in as_completed(futures):
+                res = fut.result()
+                results.append(res)
+                print(f"  {res['source']}: {res['total_missing']} missing lines")
+    finally:
+        os.unlink(target_sets_path)
+    return results
+
+
+def write_overall_summary(all_results: list, summary_path: Path) -> None:
+    """Write the per-pass SOURCE_FILE,TOTAL_MISSING summary."""
+    grand_total = sum(res["total_missing"] for res in all_results)
+    with summary_path.open("w", encoding="utf-8", newline="") as s:
+        w = csv.writer(s)
+        w.writerow(["SOURCE_FILE", "TOTAL_MISSING"])
+        w.writerows((res["source"], res["total_missing"])
+                    for res in sorted(all_results, key=lambda r: r["source"]))
+        w.writerow(["GRAND_TOTAL", grand_total])
+
+
+def main(argv: list) -> int:
+    if len(argv) < 3:
+        print(__doc__)
+        return 2
+
+    folder_a = Path(argv[0])
+    folder_b = Path(argv[1])
+    output_dir = Path(argv[2])
+    mode = (argv[3] if len(argv) > 3 else MODE).upper()
+
+    output_dir.mkdir(parents=True, exist_ok=True)
+    started = time.time()
+
+    if mode in ("A2B", "BOTH"):
+        results = run_pass(folder_a, folder_b, output_dir, folder_a.name, folder_b.name)
+        write_overall_summary(
+            results, output_dir / f"SUMMARY_{folder_a.name}_vs_{folder_b.name}.csv")
+    if mode in ("B2A", "BOTH"):
+        results = run_pass(folder_b, folder_a, output_dir, folder_b.name, folder_a.name)
+        write_overall_summary(
+            results, output_dir / f"SUMMARY_{folder_b.name}_vs_{folder_a.name}.csv")
+
+    print(f"Done in {time.time() - started:.2f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))